@@ -11,10 +11,15 @@ It can also be used directly via curl for testing and scripting.
 """
 
 import logging
-from dataclasses import asdict
-from typing import TYPE_CHECKING
+import threading
+import time
+from enum import Enum
+from typing import TYPE_CHECKING, Callable
 
-from flask import Flask, jsonify, request
+import msgspec
+import orjson
+from flask import Flask, Response, request
+from flask.json.provider import JSONProvider
 
 if TYPE_CHECKING:
     from session_manager import SessionManager
@@ -23,7 +28,57 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+
+def _default(obj):
+    """Serialize types orjson does not handle natively (e.g. RecordingState)."""
+    if isinstance(obj, Enum):
+        return obj.value
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+class ORJSONProvider(JSONProvider):
+    """Flask JSON provider backed by orjson.
+
+    Keeps jsonify()/flask.json consistent with the _json() responses the
+    endpoints build directly; dataclasses serialize without asdict().
+    """
+
+    option = orjson.OPT_SERIALIZE_DATACLASS | orjson.OPT_NAIVE_UTC
+
+    def dumps(self, obj, **kwargs) -> str:
+        return orjson.dumps(obj, option=self.option, default=_default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        # Skip the bytes -> str -> bytes round trip of the base implementation
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, option=self.option, default=_default)
+        return self._app.response_class(body, mimetype="application/json")
+
+
+class MetadataPatch(msgspec.Struct, omit_defaults=True):
+    """Body of POST /api/session/metadata. Omitted fields are left unchanged."""
+    mouse_id: str | None = None
+    recording_type: str | None = None
+    user_name: str | None = None
+    chamber: int | None = None
+
+
+def _json(obj, status: int = 200) -> Response:
+    """Serialize ``obj`` with orjson into a JSON Response."""
+    return Response(
+        orjson.dumps(obj, default=_default),
+        status=status,
+        mimetype="application/json",
+    )
+
+
 app = Flask(__name__)
+# Endpoints build responses with _json(); the provider still backs
+# flask.json for anything else (error handlers, extensions)
+app.json = ORJSONProvider(app)
 
 
 @app.after_request
@@ -35,11 +90,30 @@ def add_cors_headers(response):
     return response
 
 
-# These are set by daemon.py at startup via init_api()
-_session_manager: "SessionManager | None" = None
-_radiens_poller: "RadiensPoller | None" = None
-_frigate_controller: "FrigateController | None" = None
-_config: dict | None = None
+# /api/health has only four possible answers, so serialize them once.
+# Keyed by (radiens_connected, mqtt_connected) -> (body, status code).
+_HEALTH_RESPONSES = {
+    (radiens_ok, mqtt_ok): (
+        orjson.dumps({
+            "healthy": radiens_ok and mqtt_ok,
+            "radiens_connected": radiens_ok,
+            "mqtt_connected": mqtt_ok,
+        }),
+        200 if radiens_ok and mqtt_ok else 503,
+    )
+    for radiens_ok in (False, True)
+    for mqtt_ok in (False, True)
+}
+
+# The serialized /api/status body is reused until the TTL expires or a
+# state change calls invalidate_status().
+STATUS_CACHE_TTL = 0.5  # seconds
+_status_dirty = threading.Event()
+
+
+def invalidate_status():
+    """Mark the cached /api/status payload as stale. Safe from any thread."""
+    _status_dirty.set()
 
 
 def init_api(
@@ -47,224 +121,223 @@ def init_api(
     radiens_poller: "RadiensPoller",
     frigate_controller: "FrigateController",
     config: dict,
+    wakeup: Callable[[], None] | None = None,
+    get_snapshot: Callable[[], dict] | None = None,
 ):
     """Initialize the API with references to daemon components.
 
-    Called once by daemon.py before starting the Flask server.
-    """
-    global _session_manager, _radiens_poller, _frigate_controller, _config
-    _session_manager = session_manager
-    _radiens_poller = radiens_poller
-    _frigate_controller = frigate_controller
-    _config = config
-    logger.info("API initialized")
-
+    Called once by daemon.py before starting the Flask server. Endpoints
+    are defined here as closures over the components and registered on
+    ``app``, so no route exists until the daemon state it needs does.
 
-# ---------------------------------------------------------------------------
-# Endpoints
-# ---------------------------------------------------------------------------
-
-
-@app.route("/api/status", methods=["GET"])
-def get_status():
-    """Daemon status overview.
-
-    Returns:
-        - daemon: running state
-        - radiens: connection status, current recording state
-        - mqtt: connection status
-        - frigate: reachable or not
-        - session: active session summary (if any)
-        - pending_metadata: metadata set for next session
-    """
-    radiens_connected = _radiens_poller.connected if _radiens_poller else False
-    radiens_state = (
-        _radiens_poller.previous_state.value if _radiens_poller else "UNKNOWN"
-    )
-
-    mqtt_connected = (
-        _frigate_controller.mqtt_connected if _frigate_controller else False
-    )
+    ``wakeup`` is called after metadata changes so the daemon's main loop
+    can react without waiting out its poll interval.
 
-    active = None
-    if _session_manager and _session_manager.has_active_session:
-        session = _session_manager.active_session
-        active = {
-            "session_id": session.session_id,
-            "mouse_id": session.mouse_id,
-            "recording_type": session.recording_type,
-            "chamber": session.chamber,
-            "camera": session.camera,
-            "start_time_local": session.start_time_local,
-        }
-
-    pending = None
-    if _session_manager:
-        meta = _session_manager.pending_metadata
-        pending = {
-            "mouse_id": meta.mouse_id,
-            "recording_type": meta.recording_type,
-            "user_name": meta.user_name,
-            "chamber": meta.chamber,
-            "is_default": meta.is_default(),
-        }
-
-    return jsonify({
-        "daemon": "running",
-        "radiens": {
-            "connected": radiens_connected,
-            "recording_state": radiens_state,
-        },
-        "mqtt": {
-            "connected": mqtt_connected,
-        },
-        "session": active,
-        "pending_metadata": pending,
-    })
-
-
-@app.route("/api/session/metadata", methods=["POST"])
-def set_metadata():
-    """Set metadata for the next recording session.
-
-    Accepts JSON body with any combination of:
-        - mouse_id (str): Mouse identifier (e.g. "HETCF3R1")
-        - recording_type (str): Recording type (e.g. "basal", "sd")
-        - user_name (str): Researcher name (e.g. "andrea")
-        - chamber (int): Chamber number (0 or 1)
-
-    Partial updates are allowed -- only provided fields are changed.
-
-    Returns:
-        Updated metadata.
-
-    Example:
-        curl -X POST http://127.0.0.1:8585/api/session/metadata \\
-          -H "Content-Type: application/json" \\
-          -d '{"mouse_id": "HETCF3R1", "recording_type": "basal", "chamber": 0}'
+    ``get_snapshot`` returns a dict with ``radiens_connected``,
+    ``radiens_state`` and ``mqtt_connected``, published as a whole by the
+    daemon's poll thread. Without it, the values are read from the
+    poller and controller on each request.
     """
-    if not _session_manager:
-        return jsonify({"error": "Session manager not initialized"}), 503
-
-    data = request.get_json(silent=True)
-    if not data:
-        return jsonify({"error": "Request body must be JSON"}), 400
-
-    # Validate chamber if provided
-    if "chamber" in data:
+    if get_snapshot is None:
+        def get_snapshot() -> dict:
+            return {
+                "radiens_connected": radiens_poller.connected,
+                "radiens_state": radiens_poller.previous_state.value,
+                "mqtt_connected": frigate_controller.mqtt_connected,
+            }
+
+    lab_members = config.get("lab_members", [])
+
+    # Serialized /api/status body and the monotonic time it was built
+    status_cache: tuple[bytes, float] | None = None
+
+    def metadata_changed():
+        invalidate_status()
+        if wakeup:
+            wakeup()
+
+    # -----------------------------------------------------------------------
+    # Endpoints
+    # -----------------------------------------------------------------------
+
+    def get_status():
+        """Daemon status overview.
+
+        Returns:
+            - daemon: running state
+            - radiens: connection status, current recording state
+            - mqtt: connection status
+            - session: active session summary (if any)
+            - pending_metadata: metadata set for next session
+
+        The serialized body is cached for STATUS_CACHE_TTL seconds, or until
+        invalidate_status() is called on a state change.
+        """
+        nonlocal status_cache
+
+        cached = status_cache
+        if (
+            cached is not None
+            and not _status_dirty.is_set()
+            and time.monotonic() - cached[1] < STATUS_CACHE_TTL
+        ):
+            return Response(cached[0], mimetype="application/json")
+
+        # Clear before reading state so a change made mid-build re-dirties
+        # the cache
+        _status_dirty.clear()
+
+        snapshot = get_snapshot()
+
+        active = None
+        if session_manager.has_active_session:
+            session = session_manager.active_session
+            active = {
+                "session_id": session.session_id,
+                "mouse_id": session.mouse_id,
+                "recording_type": session.recording_type,
+                "chamber": session.chamber,
+                "camera": session.camera,
+                "start_time_local": session.start_time_local,
+            }
+
+        body = orjson.dumps({
+            "daemon": "running",
+            "radiens": {
+                "connected": snapshot["radiens_connected"],
+                "recording_state": snapshot["radiens_state"],
+            },
+            "mqtt": {
+                "connected": snapshot["mqtt_connected"],
+            },
+            "session": active,
+            "pending_metadata": session_manager.pending_metadata.as_dict,
+        })
+        status_cache = (body, time.monotonic())
+        return Response(body, mimetype="application/json")
+
+    def set_metadata():
+        """Set metadata for the next recording session.
+
+        Accepts JSON body with any combination of:
+            - mouse_id (str): Mouse identifier (e.g. "HETCF3R1")
+            - recording_type (str): Recording type (e.g. "basal", "sd")
+            - user_name (str): Researcher name (e.g. "andrea")
+            - chamber (int): Chamber number (0 or 1)
+
+        Partial updates are allowed -- only provided fields are changed.
+
+        Returns:
+            Updated metadata.
+
+        Example:
+            curl -X POST http://127.0.0.1:8585/api/session/metadata \\
+              -H "Content-Type: application/json" \\
+              -d '{"mouse_id": "HETCF3R1", "recording_type": "basal", "chamber": 0}'
+        """
+        # Parse and type-check the body in one pass; strict=False keeps
+        # accepting numeric strings such as "1" for chamber
         try:
-            chamber = int(data["chamber"])
-            if chamber not in (0, 1):
-                return jsonify({
-                    "error": f"Invalid chamber: {chamber}. Must be 0 or 1."
-                }), 400
-            data["chamber"] = chamber
-        except (ValueError, TypeError):
-            return jsonify({
-                "error": "chamber must be an integer (0 or 1)"
-            }), 400
-
-    # Validate lab member if user_name provided
-    if "user_name" in data and _config:
-        lab_members = _config.get("lab_members", [])
-        if lab_members and data["user_name"] not in lab_members:
+            patch = msgspec.json.decode(
+                request.get_data(), type=MetadataPatch, strict=False
+            )
+        except msgspec.ValidationError as e:
+            return _json({"error": str(e)}, 400)
+        except msgspec.DecodeError:
+            return _json({"error": "Request body must be JSON"}, 400)
+
+        # Null/omitted fields are dropped; a body with none left is a no-op
+        fields = msgspec.to_builtins(patch)
+
+        # Validate chamber if provided
+        if patch.chamber is not None and patch.chamber not in (0, 1):
+            return _json({
+                "error": f"Invalid chamber: {patch.chamber}. Must be 0 or 1."
+            }, 400)
+
+        # Validate lab member if user_name provided
+        if (
+            patch.user_name is not None
+            and lab_members
+            and patch.user_name not in lab_members
+        ):
             logger.warning(
                 "user_name '%s' not in lab_members list: %s",
-                data["user_name"],
+                patch.user_name,
                 lab_members,
             )
             # Warning only -- don't reject the request
 
-    updated = _session_manager.set_metadata(
-        mouse_id=data.get("mouse_id"),
-        recording_type=data.get("recording_type"),
-        user_name=data.get("user_name"),
-        chamber=data.get("chamber"),
-    )
-
-    return jsonify({
-        "status": "ok",
-        "metadata": {
-            "mouse_id": updated.mouse_id,
-            "recording_type": updated.recording_type,
-            "user_name": updated.user_name,
-            "chamber": updated.chamber,
-            "is_default": updated.is_default(),
-        },
-    })
-
-
-@app.route("/api/session/metadata", methods=["DELETE"])
-def clear_metadata():
-    """Clear pending metadata (reset to defaults)."""
-    if not _session_manager:
-        return jsonify({"error": "Session manager not initialized"}), 503
-
-    _session_manager.clear_metadata()
-    return jsonify({"status": "ok", "message": "Metadata cleared to defaults"})
-
-
-@app.route("/api/session/current", methods=["GET"])
-def get_current_session():
-    """Get the currently active session, if any.
-
-    Returns:
-        Session details if active, or {"session": null}.
-    """
-    if not _session_manager:
-        return jsonify({"error": "Session manager not initialized"}), 503
-
-    if _session_manager.has_active_session:
-        session = _session_manager.active_session
-        return jsonify({"session": asdict(session)})
-
-    return jsonify({"session": None})
-
+        updated = session_manager.set_metadata(**fields)
+        metadata_changed()
+
+        return _json({
+            "status": "ok",
+            "metadata": updated.as_dict,
+        })
+
+    def clear_metadata():
+        """Clear pending metadata (reset to defaults)."""
+        session_manager.clear_metadata()
+        metadata_changed()
+        return _json({"status": "ok", "message": "Metadata cleared to defaults"})
+
+    def get_current_session():
+        """Get the currently active session, if any.
+
+        Returns:
+            Session details if active, or {"session": null}.
+        """
+        session = session_manager.active_session
+        if session is not None:
+            return _json({"session": session.to_dict()})
+
+        return _json({"session": None})
+
+    def get_session_history():
+        """List past sessions.
+
+        Query parameters:
+            - limit (int): Max number of sessions to return (default 50, newest first)
+            - offset (int): Number of newest sessions to skip (default 0)
+
+        Returns:
+            List of session records.
+        """
+        limit = request.args.get("limit", 50, type=int)
+        limit = max(1, min(limit, 500))  # Clamp between 1 and 500
+        offset = max(0, request.args.get("offset", 0, type=int))
+
+        # Return newest first
+        sessions = [
+            s.to_dict() for s in session_manager.get_history(limit, offset)
+        ]
+
+        return _json({
+            "count": len(sessions),
+            "total": session_manager.history_total,
+            "sessions": sessions,
+        })
+
+    def health_check():
+        """Health check endpoint.
+
+        Returns 200 if the daemon is running and core services are connected.
+        Returns 503 if critical services are down.
+
+        Used by systemd watchdog and monitoring.
+        """
+        snapshot = get_snapshot()
+        body, status_code = _HEALTH_RESPONSES[
+            (bool(snapshot["radiens_connected"]), bool(snapshot["mqtt_connected"]))
+        ]
+        return Response(body, status=status_code, mimetype="application/json")
+
+    app.add_url_rule("/api/status", view_func=get_status, methods=["GET"])
+    app.add_url_rule("/api/session/metadata", view_func=set_metadata, methods=["POST"])
+    app.add_url_rule("/api/session/metadata", view_func=clear_metadata, methods=["DELETE"])
+    app.add_url_rule("/api/session/current", view_func=get_current_session, methods=["GET"])
+    app.add_url_rule("/api/session/history", view_func=get_session_history, methods=["GET"])
+    app.add_url_rule("/api/health", view_func=health_check, methods=["GET"])
 
-@app.route("/api/session/history", methods=["GET"])
-def get_session_history():
-    """List past sessions.
-
-    Query parameters:
-        - limit (int): Max number of sessions to return (default 50, newest first)
-
-    Returns:
-        List of session records.
-    """
-    if not _session_manager:
-        return jsonify({"error": "Session manager not initialized"}), 503
-
-    limit = request.args.get("limit", 50, type=int)
-    limit = max(1, min(limit, 500))  # Clamp between 1 and 500
-
-    # Return newest first
-    history = _session_manager.history
-    recent = list(reversed(history[-limit:]))
-
-    return jsonify({
-        "count": len(recent),
-        "total": len(history),
-        "sessions": [asdict(s) for s in recent],
-    })
-
-
-@app.route("/api/health", methods=["GET"])
-def health_check():
-    """Health check endpoint.
-
-    Returns 200 if the daemon is running and core services are connected.
-    Returns 503 if critical services are down.
-
-    Used by systemd watchdog and monitoring.
-    """
-    radiens_ok = _radiens_poller.connected if _radiens_poller else False
-    mqtt_ok = _frigate_controller.mqtt_connected if _frigate_controller else False
-
-    healthy = radiens_ok and mqtt_ok
-    status_code = 200 if healthy else 503
-
-    return jsonify({
-        "healthy": healthy,
-        "radiens_connected": radiens_ok,
-        "mqtt_connected": mqtt_ok,
-    }), status_code
+    logger.info("API initialized")
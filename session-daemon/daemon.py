@@ -5,7 +5,7 @@ Orchestrates all components:
 1. Loads config.yaml
 2. Connects MQTT, connects Radiens
 3. Publishes OFF to all cameras on startup (clean slate)
-4. Starts Flask API in background thread
+4. Starts Flask API (waitress) in background thread
 5. Main polling loop: poll Radiens every 1s, detect transitions
 6. SIGTERM handler: abort active session, publish OFF, disconnect
 
@@ -14,21 +14,29 @@ Usage:
 """
 
 import argparse
+import atexit
 import logging
 import os
+import queue
+import selectors
 import signal
 import sys
 import threading
 import time
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
 from pathlib import Path
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
 from radiens_poller import RadiensPoller, RadiensStatus
 from frigate_controller import FrigateController
 from session_manager import SessionManager
-from api import app, init_api
+from api import app, init_api, invalidate_status
 
 logger = logging.getLogger("neurosurveillance")
 
@@ -38,6 +46,15 @@ logger = logging.getLogger("neurosurveillance")
 
 DEFAULT_CONFIG_PATH = "/opt/neurosurveillance/config.yaml"
 
+# Background threads running Frigate exports
+EXPORT_WORKERS = 2
+
+# Seconds stop() waits for running exports to record their final status
+EXPORT_STOP_TIMEOUT = 5.0
+
+# Background thread that writes queued log records (started by setup_logging)
+_log_listener: QueueListener | None = None
+
 
 def load_config(config_path: str) -> dict:
     """Load and validate config.yaml."""
@@ -47,7 +64,7 @@ def load_config(config_path: str) -> dict:
         sys.exit(1)
 
     with open(path) as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=YamlLoader)
 
     if not config:
         logger.error("Config file is empty: %s", config_path)
@@ -64,7 +81,16 @@ def load_config(config_path: str) -> dict:
 
 
 def setup_logging(config: dict):
-    """Configure logging with console and rotating file output."""
+    """Configure logging with console and file output.
+
+    Handlers run on a QueueListener thread; callers only enqueue records,
+    so a slow disk write never blocks the polling loop.
+
+    Rotation is left to logrotate (neurosurveillance-session.logrotate);
+    WatchedFileHandler reopens the file once it has been rotated away.
+    """
+    global _log_listener
+
     daemon_cfg = config.get("daemon", {})
     log_level_str = daemon_cfg.get("log_level", "info").upper()
     log_level = getattr(logging, log_level_str, logging.INFO)
@@ -86,27 +112,61 @@ def setup_logging(config: dict):
     console = logging.StreamHandler(sys.stdout)
     console.setLevel(log_level)
     console.setFormatter(formatter)
-    root_logger.addHandler(console)
 
-    # File handler (rotating, 10MB, keep 5 files)
+    # File handler (rotated externally by logrotate, 10MB, keep 5 files)
     log_file = os.path.join(log_dir, "session-daemon.log")
-    file_handler = RotatingFileHandler(
-        log_file, maxBytes=10 * 1024 * 1024, backupCount=5
-    )
+    file_handler = WatchedFileHandler(log_file)
     file_handler.setLevel(log_level)
     file_handler.setFormatter(formatter)
-    root_logger.addHandler(file_handler)
+
+    # Thread/process info is not in the format; skip collecting it per record
+    logging.logThreads = False
+    logging.logProcesses = False
+
+    # Drop handlers installed earlier (main()'s basicConfig) so every record
+    # goes through the queue only, not also to a synchronous stderr handler
+    for handler in root_logger.handlers[:]:
+        root_logger.removeHandler(handler)
+        handler.close()
+
+    log_queue = queue.SimpleQueue()
+    root_logger.addHandler(QueueHandler(log_queue))
+    _log_listener = QueueListener(
+        log_queue, console, file_handler, respect_handler_level=True
+    )
+    _log_listener.start()
+    # The listener thread is a daemon; drain it on every exit path,
+    # including sys.exit() before stop() runs
+    atexit.register(stop_logging)
 
     logger.info("Logging configured: level=%s, file=%s", log_level_str, log_file)
 
 
+def stop_logging():
+    """Flush queued log records and stop the listener thread."""
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
 class SessionDaemon:
     """Main daemon that orchestrates Radiens polling, Frigate control, and the API."""
 
     def __init__(self, config: dict):
         self.config = config
         self._running = False
-        self._shutdown_event = threading.Event()
+
+        # Self-pipes that break the main loop's select() early: one written
+        # by wake() (API, MQTT events), one by the interpreter on signal
+        # delivery (signal.set_wakeup_fd, registered in start())
+        self._wakeup_r, self._wakeup_w = os.pipe()
+        self._signal_r, self._signal_w = os.pipe()
+        self._selector = selectors.DefaultSelector()
+        for fd in (self._wakeup_r, self._wakeup_w, self._signal_r, self._signal_w):
+            os.set_blocking(fd, False)
+        self._selector.register(self._wakeup_r, selectors.EVENT_READ)
+        self._selector.register(self._signal_r, selectors.EVENT_READ)
 
         daemon_cfg = config.get("daemon", {})
         self.poll_interval = daemon_cfg.get("poll_interval", 1.0)
@@ -130,8 +190,10 @@ class SessionDaemon:
         self.frigate = FrigateController(
             mqtt_host=config["mqtt"].get("host", "127.0.0.1"),
             mqtt_port=config["mqtt"].get("port", 1883),
+            mqtt_keepalive=config["mqtt"].get("keepalive", 60),
             frigate_url=config["frigate"].get("url", "http://127.0.0.1:5000"),
             cameras=cameras,
+            on_connection_change=self._handle_mqtt_connection_change,
         )
 
         self.poller = RadiensPoller(
@@ -140,12 +202,32 @@ class SessionDaemon:
             on_session_end=self._handle_session_end,
         )
 
+        # Frigate exports wait minutes on the Frigate API; run them on a few
+        # reused workers rather than a new thread per session. The workers
+        # are daemon threads (unlike ThreadPoolExecutor's), so an HTTP call
+        # still in flight at shutdown cannot hold the process past systemd's
+        # TimeoutStopSec.
+        self._export_queue: queue.SimpleQueue = queue.SimpleQueue()
+        # Exports queued or running; stop() waits for it to reach zero
+        self._exports_running = 0
+        self._exports_idle = threading.Condition()
+        for i in range(EXPORT_WORKERS):
+            threading.Thread(
+                target=self._export_worker, daemon=True, name=f"export-{i}"
+            ).start()
+
+        # Connection state read by the API. Replaced wholesale (never
+        # mutated) so API threads always see a consistent set of values.
+        self._snapshot = self._build_snapshot()
+
         # Initialize the Flask API with references to components
         init_api(
             session_manager=self.session_manager,
             radiens_poller=self.poller,
             frigate_controller=self.frigate,
             config=config,
+            wakeup=self.wake,
+            get_snapshot=lambda: self._snapshot,
         )
 
     def start(self):
@@ -156,7 +238,9 @@ class SessionDaemon:
 
         self._running = True
 
-        # Register signal handlers
+        # Register signal handlers. The wakeup fd makes a signal interrupt
+        # the main loop's select() immediately.
+        signal.set_wakeup_fd(self._signal_w)
         signal.signal(signal.SIGTERM, self._signal_handler)
         signal.signal(signal.SIGINT, self._signal_handler)
 
@@ -203,18 +287,62 @@ class SessionDaemon:
         )
         self._main_loop()
 
-    def _main_loop(self):
-        """Poll Radiens continuously. Transitions trigger callbacks."""
-        while self._running and not self._shutdown_event.is_set():
-            # If Radiens is not connected, try to reconnect
-            if not self.poller.connected:
-                self.poller.connect()
+        # Loop exits once a signal handler clears _running
+        self.stop()
 
-            # Poll (handles transitions via callbacks)
-            self.poller.poll()
+    def wake(self):
+        """Wake the main loop early. Safe to call from any thread."""
+        try:
+            os.write(self._wakeup_w, b"\0")
+        except BlockingIOError:
+            pass  # Pipe full: a wakeup is already pending
+
+    def _main_loop(self):
+        """Poll Radiens continuously. Transitions trigger callbacks.
 
-            # Sleep with shutdown check
-            self._shutdown_event.wait(timeout=self.poll_interval)
+        Radiens is polled every poller.current_poll_interval seconds (the
+        configured interval, backed off while Radiens is down); in between,
+        the loop sleeps until the next deadline or until wake() is called.
+        """
+        next_poll = time.monotonic()
+        while self._running:
+            now = time.monotonic()
+            if now >= next_poll:
+                # If Radiens is not connected, try to reconnect; skip the
+                # poll if that fails, it would only fail the same way
+                if self.poller.connected or self.poller.connect():
+                    # Poll (handles transitions via callbacks)
+                    self.poller.poll()
+                self._publish_snapshot()
+                next_poll = now + self.poller.current_poll_interval
+
+            # Sleep until the next poll is due or something wakes us
+            timeout = max(0.0, next_poll - time.monotonic())
+            for key, _ in self._selector.select(timeout=timeout):
+                self._drain(key.fd)
+
+    @staticmethod
+    def _drain(fd: int):
+        """Discard pending wakeup bytes from a non-blocking pipe."""
+        try:
+            while os.read(fd, 512):
+                pass
+        except BlockingIOError:
+            pass
+
+    def _build_snapshot(self) -> dict:
+        return {
+            "radiens_connected": self.poller.connected,
+            "radiens_state": self.poller.previous_state.value,
+            "mqtt_connected": self.frigate.mqtt_connected,
+        }
+
+    def _publish_snapshot(self):
+        """Swap in a fresh connection snapshot; invalidate status if changed."""
+        snapshot = self._build_snapshot()
+        if snapshot != self._snapshot:
+            self._snapshot = snapshot
+            invalidate_status()
 
     def _handle_session_start(self, status: RadiensStatus):
         """Called when Radiens transitions R_OFF -> R_ON."""
@@ -226,8 +354,11 @@ class SessionDaemon:
             radiens_file_path=status.file_path,
         )
 
-        # Enable Frigate recording for this session's camera
-        if not self.frigate.set_recording(session.camera, enabled=True):
+        # Enable Frigate recording for this session's camera. Wait for the
+        # broker's PUBACK: a lost ON would leave the session without video
+        if not self.frigate.set_recording(
+            session.camera, enabled=True, strict=True
+        ):
             logger.error(
                 "Failed to enable Frigate recording for %s. "
                 "Video may not be captured for this session!",
@@ -241,6 +372,7 @@ class SessionDaemon:
             session.mouse_id,
             session.recording_type,
         )
+        invalidate_status()
 
     def _handle_session_end(self, status: RadiensStatus):
         """Called when Radiens transitions R_ON -> R_OFF."""
@@ -252,6 +384,8 @@ class SessionDaemon:
             logger.warning("Session end detected but no active session to close")
             return
 
+        invalidate_status()
+
         # Disable Frigate recording
         self.frigate.set_recording(session.camera, enabled=False)
 
@@ -262,18 +396,30 @@ class SessionDaemon:
             session.video_filename,
         )
 
-        # Export video from Frigate (runs in a background thread to avoid
+        # Export video from Frigate (runs on an export worker to avoid
         # blocking the main polling loop)
-        export_thread = threading.Thread(
-            target=self._export_session,
-            args=(session,),
-            daemon=True,
-            name=f"export-{session.session_id[:8]}",
-        )
-        export_thread.start()
+        with self._exports_idle:
+            self._exports_running += 1
+        self._export_queue.put(session)
+
+    def _handle_mqtt_connection_change(self, connected: bool):
+        """Called from the paho network thread when MQTT connects/drops."""
+        self._publish_snapshot()
+        self.wake()
+
+    def _export_worker(self):
+        """Run queued exports, one at a time. Body of each export thread."""
+        while True:
+            session = self._export_queue.get()
+            try:
+                self._export_session(session)
+            finally:
+                with self._exports_idle:
+                    self._exports_running -= 1
+                    self._exports_idle.notify_all()
 
     def _export_session(self, session):
-        """Export video from Frigate. Runs in a background thread.
+        """Export video from Frigate. Runs on an export worker thread.
 
         Args:
             session: The completed SessionRecord.
@@ -300,20 +446,29 @@ class SessionDaemon:
                     "Frigate export request failed for session %s",
                     session.session_id[:8],
                 )
-                self.session_manager.update_export_status("failed: export request rejected")
+                self.session_manager.update_export_status(
+                    session, "failed: export request rejected"
+                )
                 return
 
             # Wait for export to complete
             result = self.frigate.wait_for_export(export_id)
             if result is None:
+                if not self._running:
+                    self.session_manager.update_export_status(
+                        session, "failed: daemon shutdown during export"
+                    )
+                    return
                 logger.error(
                     "Frigate export timed out for session %s",
                     session.session_id[:8],
                 )
-                self.session_manager.update_export_status("failed: export timed out")
+                self.session_manager.update_export_status(
+                    session, "failed: export timed out"
+                )
                 return
 
-            self.session_manager.update_export_status("completed")
+            self.session_manager.update_export_status(session, "completed")
             logger.info(
                 "Export completed for session %s: %s",
                 session.session_id[:8],
@@ -331,26 +486,47 @@ class SessionDaemon:
                 e,
                 exc_info=True,
             )
-            self.session_manager.update_export_status(f"failed: {e}")
+            self.session_manager.update_export_status(session, f"failed: {e}")
 
     def _run_api(self, host: str, port: int):
-        """Run the Flask API server. Called in a background thread."""
-        # Suppress Flask/Werkzeug startup banner and request logs
-        werkzeug_logger = logging.getLogger("werkzeug")
-        werkzeug_logger.setLevel(logging.WARNING)
+        """Run the Flask API server. Called in a background thread.
 
-        app.run(host=host, port=port, debug=False, use_reloader=False)
+        Prefers uvicorn (asyncio, with uvloop/httptools when installed) with
+        the WSGI app wrapped by a2wsgi. Falls back to waitress, whose
+        thread pool still keeps a slow client from stalling other pollers.
+        """
+        try:
+            import uvicorn
+            from a2wsgi import WSGIMiddleware
+        except ImportError:
+            from waitress import serve
+
+            serve(app, host=host, port=port, threads=4, ident=None, _quiet=True)
+            return
+
+        uvicorn.run(
+            WSGIMiddleware(app),
+            host=host,
+            port=port,
+            loop="auto",
+            http="auto",
+            log_level="warning",
+            log_config=None,  # Keep the daemon's own logging setup
+        )
 
     def _signal_handler(self, signum, frame):
-        """Handle SIGTERM/SIGINT for graceful shutdown."""
+        """Handle SIGTERM/SIGINT for graceful shutdown.
+
+        Only flags the main loop to exit; start() runs stop() once it has.
+        """
         sig_name = signal.Signals(signum).name
         logger.info("Received %s, shutting down...", sig_name)
-        self.stop()
+        self._running = False
 
     def stop(self):
         """Graceful shutdown: abort active session, stop recording, disconnect."""
         self._running = False
-        self._shutdown_event.set()
+        self.wake()
 
         # Abort active session if any
         if self.session_manager.has_active_session:
@@ -358,7 +534,33 @@ class SessionDaemon:
             session = self.session_manager.abort_session(reason="daemon shutdown")
             if session:
                 # Try to stop recording for the aborted session's camera
-                self.frigate.set_recording(session.camera, enabled=False)
+                self.frigate.set_recording(
+                    session.camera, enabled=False, strict=True
+                )
+
+        # Drop queued exports and end the wait of any already running
+        while True:
+            try:
+                self._export_queue.get_nowait()
+            except queue.Empty:
+                break
+            with self._exports_idle:
+                self._exports_running -= 1
+        self.frigate.close()
+
+        # Let running exports record their final status before the flush
+        with self._exports_idle:
+            if not self._exports_idle.wait_for(
+                lambda: self._exports_running == 0,
+                timeout=EXPORT_STOP_TIMEOUT,
+            ):
+                logger.warning(
+                    "%d export(s) still running at shutdown",
+                    self._exports_running,
+                )
+
+        # Make sure the aborted/ended session JSON reaches disk
+        self.session_manager.flush()
 
         # Stop all recording (safety net)
         logger.info("Stopping all camera recordings...")
@@ -369,6 +571,7 @@ class SessionDaemon:
         self.frigate.disconnect_mqtt()
 
         logger.info("Session Daemon stopped")
+        stop_logging()
 
 
 def main():
@@ -11,18 +11,32 @@ to work. If disabled in config, MQTT/UI toggle has no effect.
 
 import json
 import logging
+import socket
+import threading
 import time
-from typing import Optional
+from typing import Callable, Optional
 
 import paho.mqtt.client as mqtt
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 logger = logging.getLogger(__name__)
 
-# Frigate export status polling
-EXPORT_POLL_INTERVAL = 2.0   # seconds between export status checks
+# Frigate export status polling: the interval starts short and grows
+# geometrically, so quick exports return fast and long ones poll rarely
+EXPORT_POLL_INITIAL = 0.5    # seconds before the first re-check
+EXPORT_POLL_BACKOFF = 1.5    # interval multiplier after each check
+EXPORT_POLL_MAX = 8.0        # cap on the interval between checks
 EXPORT_TIMEOUT = 300.0       # 5 minutes max wait for export
 
+# Frigate health checks within this window reuse the last result
+FRIGATE_HEALTH_TTL = 2.0     # seconds
+
+
+def _recording_topic(camera_id: str) -> str:
+    return f"frigate/{camera_id}/recordings/set"
+
 
 class FrigateController:
     """Controls Frigate recording via MQTT and exports via HTTP API.
@@ -32,6 +46,12 @@ class FrigateController:
         mqtt_port: MQTT broker port.
         frigate_url: Frigate HTTP API base URL (e.g. http://127.0.0.1:5000).
         cameras: Dict mapping chamber numbers to camera IDs.
+        mqtt_keepalive: MQTT keepalive in seconds. Lower values detect a
+            dead broker sooner at the cost of more PINGREQ wakeups; a
+            broker on the same host can use a longer value, since a dropped
+            local connection is usually reported by the OS right away.
+        on_connection_change: Callback with the new state whenever the MQTT
+            connection comes up or drops. Runs on the paho network thread.
     """
 
     def __init__(
@@ -40,33 +60,54 @@ class FrigateController:
         mqtt_port: int = 1883,
         frigate_url: str = "http://127.0.0.1:5000",
         cameras: Optional[dict] = None,
+        mqtt_keepalive: int = 60,
+        on_connection_change: Optional[Callable[[bool], None]] = None,
     ):
         self.mqtt_host = mqtt_host
         self.mqtt_port = mqtt_port
+        self.mqtt_keepalive = mqtt_keepalive
         self.frigate_url = frigate_url.rstrip("/")
         self.cameras = cameras or {"chamber_0": "pi_cam_0", "chamber_1": "pi_cam_1"}
+        self.on_connection_change = on_connection_change
 
         self._mqtt_client: Optional[mqtt.Client] = None
         self._mqtt_connected = False
+        self._connect_event = threading.Event()  # Set by _on_connect on CONNACK
+        self._closed = threading.Event()  # Set by close(); ends export waits
+
+        # (monotonic time, result) of the last Frigate health check
+        self._health_cache: tuple[float, bool] = (float("-inf"), False)
+
+        # Keep-alive HTTP session shared by all Frigate API calls. Transient
+        # 5xx responses to GETs are retried inline (POSTs are not retried).
+        self._http = requests.Session()
+        self._http.mount(self.frigate_url, HTTPAdapter(
+            pool_connections=1,
+            pool_maxsize=4,
+            max_retries=Retry(
+                total=2, backoff_factor=0.2, status_forcelist=[502, 503, 504]
+            ),
+        ))
 
     def connect_mqtt(self) -> bool:
         """Connect to the MQTT broker. Returns True if successful."""
         try:
+            self._connect_event.clear()
             self._mqtt_client = mqtt.Client(
                 callback_api_version=mqtt.CallbackAPIVersion.VERSION2,
                 client_id="neurosurveillance-session-daemon",
             )
             self._mqtt_client.on_connect = self._on_connect
             self._mqtt_client.on_disconnect = self._on_disconnect
-            self._mqtt_client.connect(self.mqtt_host, self.mqtt_port, keepalive=60)
+            # Set on every (re)connect, before any packet is sent
+            self._mqtt_client.on_socket_open = self._on_socket_open
+            self._mqtt_client.connect(
+                self.mqtt_host, self.mqtt_port, keepalive=self.mqtt_keepalive
+            )
             self._mqtt_client.loop_start()
 
             # Wait briefly for connection callback
-            deadline = time.time() + 5.0
-            while not self._mqtt_connected and time.time() < deadline:
-                time.sleep(0.1)
-
-            if not self._mqtt_connected:
+            if not self._connect_event.wait(5.0):
                 logger.error("MQTT connection timed out after 5s")
                 return False
 
@@ -86,18 +127,37 @@ class FrigateController:
                 logger.warning("Error disconnecting MQTT: %s", e)
             finally:
                 self._mqtt_connected = False
+                self._connect_event.clear()
+
+    def close(self):
+        """Stop any export waits and release the pooled HTTP connections."""
+        self._closed.set()
+        self._http.close()
 
     def _on_connect(self, client, userdata, flags, reason_code, properties=None):
         if reason_code == 0:
             self._mqtt_connected = True
+            self._connect_event.set()
             logger.info("Connected to MQTT broker at %s:%d", self.mqtt_host, self.mqtt_port)
+            if self.on_connection_change:
+                self.on_connection_change(True)
         else:
             logger.error("MQTT connection failed with code: %s", reason_code)
 
+    def _on_socket_open(self, client, userdata, sock):
+        # ON/OFF publishes are a few bytes; disable Nagle so they are not
+        # held back waiting for the ACK of the previous segment
+        try:
+            sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        except (AttributeError, OSError) as e:
+            logger.debug("Could not set TCP_NODELAY on MQTT socket: %s", e)
+
     def _on_disconnect(self, client, userdata, flags, reason_code, properties=None):
         self._mqtt_connected = False
         if reason_code != 0:
             logger.warning("Unexpected MQTT disconnect (code: %s), will auto-reconnect", reason_code)
+        if self.on_connection_change:
+            self.on_connection_change(False)
 
     def get_camera_id(self, chamber: int) -> str:
         """Get camera ID for a chamber number."""
@@ -107,41 +167,103 @@ class FrigateController:
             raise ValueError(f"No camera configured for chamber {chamber} (key: {key})")
         return camera
 
-    def set_recording(self, camera_id: str, enabled: bool) -> bool:
+    def set_recording(
+        self, camera_id: str, enabled: bool, strict: bool = False
+    ) -> bool:
         """Toggle recording for a camera via MQTT.
 
+        By default the toggle is published best-effort at QoS 0: the
+        message is handed to the local broker without waiting for a PUBACK,
+        and nothing checks that it arrived. Use ``strict=True`` (QoS 1,
+        wait for PUBACK) where the message must not be lost: the ON that
+        starts a session, and the OFF right before disconnecting on
+        shutdown.
+
         Args:
             camera_id: Frigate camera name (e.g. 'pi_cam_0').
             enabled: True to start recording, False to stop.
+            strict: Publish at QoS 1 and wait for the broker's PUBACK.
 
         Returns:
             True if the MQTT message was published successfully.
         """
-        if not self._mqtt_connected or self._mqtt_client is None:
-            logger.error("Cannot set recording: MQTT not connected")
+        info = self._publish_nowait(camera_id, enabled, qos=1 if strict else 0)
+        if info is None:
             return False
-
-        topic = f"frigate/{camera_id}/recordings/set"
-        payload = "ON" if enabled else "OFF"
-
-        try:
-            result = self._mqtt_client.publish(topic, payload, qos=1)
-            result.wait_for_publish(timeout=5.0)
-            logger.info("Published %s to %s", payload, topic)
-            return True
-        except Exception as e:
-            logger.error("Failed to publish MQTT message: %s", e)
+        if strict and not self._wait_for_puback(info, camera_id):
             return False
+        logger.info(
+            "Published %s to %s", "ON" if enabled else "OFF", _recording_topic(camera_id)
+        )
+        return True
 
     def stop_all_recording(self) -> bool:
-        """Stop recording on all cameras. Used at daemon startup for clean slate."""
+        """Stop recording on all cameras. Used at daemon startup for clean slate.
+
+        Publishes at QoS 1 since this also runs as the shutdown safety net,
+        right before the MQTT connection is torn down. All OFF messages are
+        sent first and their PUBACKs awaited together, so the cameras cost
+        one broker round trip rather than one each.
+        """
         success = True
+        pending = []
         for key, camera_id in self.cameras.items():
-            if not self.set_recording(camera_id, enabled=False):
+            info = self._publish_nowait(camera_id, enabled=False, qos=1)
+            if info is None:
+                logger.error("Failed to stop recording for %s (%s)", key, camera_id)
+                success = False
+            else:
+                pending.append((key, camera_id, info))
+
+        for key, camera_id, info in pending:
+            if self._wait_for_puback(info, camera_id):
+                logger.info("Published OFF to %s", _recording_topic(camera_id))
+            else:
                 logger.error("Failed to stop recording for %s (%s)", key, camera_id)
                 success = False
         return success
 
+    def _publish_nowait(
+        self, camera_id: str, enabled: bool, qos: int
+    ) -> Optional[mqtt.MQTTMessageInfo]:
+        """Queue a recording toggle without waiting for the broker.
+
+        Returns:
+            The paho message handle, or None if the publish was rejected.
+        """
+        if not self._mqtt_connected or self._mqtt_client is None:
+            logger.error("Cannot set recording: MQTT not connected")
+            return None
+
+        topic = _recording_topic(camera_id)
+        payload = "ON" if enabled else "OFF"
+
+        try:
+            info = self._mqtt_client.publish(topic, payload, qos=qos)
+        except Exception as e:
+            logger.error("Failed to publish MQTT message: %s", e)
+            return None
+
+        if info.rc != mqtt.MQTT_ERR_SUCCESS:
+            logger.error(
+                "Failed to publish %s to %s: %s",
+                payload, topic, mqtt.error_string(info.rc),
+            )
+            return None
+        return info
+
+    def _wait_for_puback(self, info: mqtt.MQTTMessageInfo, camera_id: str) -> bool:
+        """Wait up to 5s for a QoS 1 publish to be acknowledged."""
+        try:
+            info.wait_for_publish(timeout=5.0)
+        except Exception as e:
+            logger.error("Failed to publish MQTT message: %s", e)
+            return False
+        if not info.is_published():
+            logger.error("No PUBACK for %s within 5s", _recording_topic(camera_id))
+            return False
+        return True
+
     def export_recording(
         self,
         camera_id: str,
@@ -169,7 +291,7 @@ class FrigateController:
                 "Requesting Frigate export: camera=%s, start=%d, end=%d (duration=%ds)",
                 camera_id, start_ts, end_ts, end_ts - start_ts,
             )
-            response = requests.post(url, timeout=30)
+            response = self._http.post(url, timeout=30)
             response.raise_for_status()
 
             data = response.json()
@@ -196,40 +318,85 @@ class FrigateController:
         Returns:
             Export metadata dict if completed, None on timeout or error.
         """
+        return self.wait_for_exports([export_id])[export_id]
+
+    def wait_for_exports(self, export_ids: list[str]) -> dict[str, Optional[dict]]:
+        """Poll Frigate until all given exports are complete or time out.
+
+        Each poll fetches /api/exports once and checks it for every export
+        still pending. The poll interval backs off from EXPORT_POLL_INITIAL
+        to EXPORT_POLL_MAX seconds. close() stops the wait early.
+
+        Args:
+            export_ids: Export IDs returned by export_recording().
+
+        Returns:
+            Dict mapping each export ID to its metadata dict, or None if it
+            did not complete before the timeout (or close()).
+        """
         url = f"{self.frigate_url}/api/exports"
         deadline = time.time() + EXPORT_TIMEOUT
-        logger.info("Waiting for export %s to complete...", export_id)
+        results: dict[str, Optional[dict]] = dict.fromkeys(export_ids)
+        pending = set(export_ids)
+        etag = None
+        interval = EXPORT_POLL_INITIAL
+        logger.info("Waiting for export(s) %s to complete...", ", ".join(export_ids))
 
-        while time.time() < deadline:
+        while pending and time.time() < deadline:
             try:
-                response = requests.get(url, timeout=10)
-                response.raise_for_status()
-                exports = response.json()
-
-                # Find our export in the list
-                for export in exports:
-                    eid = export.get("id") or export.get("name")
-                    if eid == export_id:
-                        logger.info("Export %s completed", export_id)
-                        return export
-
-                # Export not in list yet -- still processing
-                time.sleep(EXPORT_POLL_INTERVAL)
+                # Conditional GET: a 304 means the list is unchanged since the
+                # last poll, so no pending export has appeared in it
+                headers = {"If-None-Match": etag} if etag else None
+                response = self._http.get(url, headers=headers, timeout=10)
+                if response.status_code != 304:
+                    response.raise_for_status()
+                    etag = response.headers.get("ETag")
+
+                    # Find our exports in the list
+                    for export in response.json():
+                        eid = export.get("id") or export.get("name")
+                        if eid in pending:
+                            logger.info("Export %s completed", eid)
+                            results[eid] = export
+                            pending.discard(eid)
+                    if not pending:
+                        break
+
+                # Remaining exports not in list yet -- still processing
 
             except Exception as e:
                 logger.warning("Error checking export status: %s", e)
-                time.sleep(EXPORT_POLL_INTERVAL)
 
-        logger.error("Export %s timed out after %ds", export_id, int(EXPORT_TIMEOUT))
-        return None
+            if self._closed.wait(interval):
+                logger.warning(
+                    "Stopped waiting for export(s) %s: controller closed",
+                    ", ".join(sorted(pending)),
+                )
+                return results
+            interval = min(interval * EXPORT_POLL_BACKOFF, EXPORT_POLL_MAX)
+
+        for eid in pending:
+            logger.error("Export %s timed out after %ds", eid, int(EXPORT_TIMEOUT))
+        return results
 
     def check_frigate_health(self) -> bool:
-        """Check if Frigate is reachable."""
+        """Check if Frigate is reachable.
+
+        Results are cached for FRIGATE_HEALTH_TTL seconds so bursts of
+        callers cost at most one request to Frigate.
+        """
+        now = time.monotonic()
+        checked_at, ok = self._health_cache
+        if now - checked_at < FRIGATE_HEALTH_TTL:
+            return ok
+
         try:
-            response = requests.get(f"{self.frigate_url}/api/stats", timeout=5)
-            return response.status_code == 200
+            response = self._http.get(f"{self.frigate_url}/api/stats", timeout=5)
+            ok = response.status_code == 200
         except Exception:
-            return False
+            ok = False
+        self._health_cache = (now, ok)
+        return ok
 
     @property
     def mqtt_connected(self) -> bool:
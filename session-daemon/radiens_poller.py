@@ -13,6 +13,15 @@ from dataclasses import dataclass, field
 from enum import Enum
 from typing import Callable, Optional
 
+# 'radiens' ships with the NeuroNexus installer, not PyPI. Import it once
+# so the daemon still starts without it and connect() can fail fast.
+try:
+    from radiens import AllegoClient
+    _RADIENS_AVAILABLE = True
+except ImportError:
+    AllegoClient = None
+    _RADIENS_AVAILABLE = False
+
 logger = logging.getLogger(__name__)
 
 
@@ -23,6 +32,13 @@ class RecordingState(Enum):
     UNKNOWN = "UNKNOWN"
 
 
+# Radiens recording mode string -> RecordingState
+_REC_STATE_MAP = {
+    "R_ON": RecordingState.ON,
+    "R_OFF": RecordingState.OFF,
+}
+
+
 @dataclass
 class RadiensStatus:
     """Snapshot of Radiens state from a single poll."""
@@ -38,6 +54,10 @@ class RadiensStatus:
 class RadiensPoller:
     """Polls Radiens AllegoClient for recording state transitions.
 
+    While Radiens is unreachable, current_poll_interval doubles on each
+    failed connect/poll (up to 60s) and snaps back to poll_interval on the
+    next success. The daemon's main loop sleeps for that interval.
+
     Args:
         poll_interval: Seconds between polls (default 1.0).
         on_session_start: Callback when R_OFF -> R_ON detected.
@@ -59,28 +79,33 @@ class RadiensPoller:
         self._connected = False
         self._consecutive_errors = 0
         self._max_silent_errors = 5  # Log every Nth consecutive error
+        self._current_interval = poll_interval
+        self._max_interval = 60.0  # Backoff cap while Radiens is down
 
     def connect(self) -> bool:
         """Connect to Radiens. Returns True if successful."""
+        if not _RADIENS_AVAILABLE:
+            logger.error(
+                "radiens package not installed. "
+                "Install it from NeuroNexus (not available on PyPI)."
+            )
+            self._connected = False
+            self._backoff()
+            return False
+
         try:
-            from radiens import AllegoClient
             self._client = AllegoClient()
             # Test the connection with a status poll
             status = self._client.get_status()
             self._connected = True
             self._consecutive_errors = 0
+            self._current_interval = self.poll_interval
             logger.info("Connected to Radiens (recording: %s)", status.recording)
             return True
-        except ImportError:
-            logger.error(
-                "radiens package not installed. "
-                "Install it from NeuroNexus (not available on PyPI)."
-            )
-            self._connected = False
-            return False
         except Exception as e:
             logger.error("Failed to connect to Radiens: %s", e)
             self._connected = False
+            self._backoff()
             return False
 
     def poll(self) -> RadiensStatus:
@@ -100,16 +125,13 @@ class RadiensPoller:
             allego_status = self._client.get_status()
             self._connected = True
             self._consecutive_errors = 0
+            self._current_interval = self.poll_interval
 
             # Parse recording state
             rec = allego_status.recording
             rec_mode = str(rec.mode) if hasattr(rec, "mode") else str(rec)
-            if rec_mode == "R_ON":
-                current_state = RecordingState.ON
-            elif rec_mode == "R_OFF":
-                current_state = RecordingState.OFF
-            else:
-                current_state = RecordingState.UNKNOWN
+            current_state = _REC_STATE_MAP.get(rec_mode, RecordingState.UNKNOWN)
+            if current_state is RecordingState.UNKNOWN:
                 logger.warning("Unexpected recording state: %s", rec_mode)
 
             # Extract metadata from recording spec
@@ -152,6 +174,7 @@ class RadiensPoller:
         except Exception as e:
             self._consecutive_errors += 1
             self._connected = False
+            self._backoff()
 
             # Avoid log spam: log first error, then every Nth
             if (
@@ -170,6 +193,15 @@ class RadiensPoller:
                 error=str(e),
             )
 
+    def _backoff(self):
+        """Double the poll interval after a failure, up to the cap."""
+        self._current_interval = min(self._current_interval * 2, self._max_interval)
+
+    @property
+    def current_poll_interval(self) -> float:
+        """Seconds to wait before the next poll (grows while Radiens is down)."""
+        return self._current_interval
+
     @property
     def connected(self) -> bool:
         """Whether the last poll was successful."""
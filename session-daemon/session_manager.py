@@ -5,23 +5,37 @@ Handles:
 - Session metadata (mouse ID, recording type, user, chamber)
 - Filename generation (YYMMDDHHMM_mouseID_type.mp4)
 - Session JSON sidecar file creation
-- Session history tracking
+- Session history tracking (history.jsonl index, one JSON record per line)
 """
 
+import dataclasses
 import json
 import logging
 import os
+import queue
+import threading
 import time
 import uuid
-from dataclasses import dataclass, field, asdict
-from datetime import datetime, timezone
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone, tzinfo
+from itertools import islice
 from pathlib import Path
 from typing import Optional
 
 from zoneinfo import ZoneInfo
 
+try:
+    import orjson
+except ImportError:  # Fall back to the stdlib encoder
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Most recent completed sessions kept in memory. Older ones stay in
+# history.jsonl and are read from there on demand (see get_history()).
+HISTORY_MAX_RECORDS = 500
+
 
 @dataclass
 class SessionMetadata:
@@ -30,6 +44,10 @@ class SessionMetadata:
     recording_type: str = "unknown"
     user_name: str = "unknown"
     chamber: int = 0
+    _as_dict: dict = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._refresh_dict()
 
     def is_default(self) -> bool:
         """Returns True if no metadata was explicitly set."""
@@ -39,6 +57,40 @@ class SessionMetadata:
             and self.user_name == "unknown"
         )
 
+    def update(
+        self,
+        mouse_id: Optional[str] = None,
+        recording_type: Optional[str] = None,
+        user_name: Optional[str] = None,
+        chamber: Optional[int] = None,
+    ):
+        """Apply a partial update; None leaves a field unchanged."""
+        if mouse_id is not None:
+            self.mouse_id = mouse_id
+        if recording_type is not None:
+            self.recording_type = recording_type
+        if user_name is not None:
+            self.user_name = user_name
+        if chamber is not None:
+            self.chamber = chamber
+        self._refresh_dict()
+
+    def _refresh_dict(self):
+        # Swap in a new dict rather than mutating, so readers never see
+        # a half-updated mapping
+        self._as_dict = {
+            "mouse_id": self.mouse_id,
+            "recording_type": self.recording_type,
+            "user_name": self.user_name,
+            "chamber": self.chamber,
+            "is_default": self.is_default(),
+        }
+
+    @property
+    def as_dict(self) -> dict:
+        """Prebuilt dict of the fields plus is_default. Do not mutate."""
+        return self._as_dict
+
 
 @dataclass
 class SessionRecord:
@@ -61,6 +113,67 @@ class SessionRecord:
     nas_transfer_status: str = "skipped"
 
 
+def _make_to_dict(cls):
+    """Generate a flat to_dict() for a dataclass, once, at import time.
+
+    Unlike dataclasses.asdict(), the generated method neither re-inspects
+    the fields nor deep-copies values on every call. Fields that are
+    themselves dataclasses are converted through their own to_dict().
+    """
+    items = []
+    for f in dataclasses.fields(cls):
+        if dataclasses.is_dataclass(f.type):
+            items.append(f"{f.name!r}: self.{f.name}.to_dict()")
+        else:
+            items.append(f"{f.name!r}: self.{f.name}")
+    src = "def to_dict(self):\n    return {" + ", ".join(items) + "}\n"
+    ns: dict = {}
+    exec(src, ns)
+    return ns["to_dict"]
+
+
+SessionRecord.to_dict = _make_to_dict(SessionRecord)
+
+
+def _fixed_offset_tz(tz: ZoneInfo) -> tzinfo:
+    """Return a fixed-offset equivalent of ``tz`` if its offset never changes.
+
+    Checked once a day across the current and next year, so zones that
+    shift at odd times (e.g. Africa/Casablanca around Ramadan) are caught
+    too; any zone whose offset changes is returned unchanged.
+    """
+    start = datetime(datetime.now(timezone.utc).year, 1, 1, tzinfo=timezone.utc)
+    offsets = set()
+    for day in range(2 * 366):
+        local = (start + timedelta(days=day)).astimezone(tz)
+        if local.dst():
+            return tz
+        offsets.add(local.utcoffset())
+    if len(offsets) == 1:
+        return timezone(offsets.pop())
+    return tz
+
+
+def _dumps(data: dict, indent: bool = False) -> bytes:
+    """Encode ``data`` as UTF-8 JSON, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(data, indent=2 if indent else None).encode()
+
+
+_loads = orjson.loads if orjson is not None else json.loads
+
+# SessionRecord field names, computed once for loading saved records
+_SESSION_FIELDS = frozenset(f.name for f in dataclasses.fields(SessionRecord))
+
+
+def _record_from_dict(data: dict) -> SessionRecord:
+    """Build a SessionRecord from saved JSON, ignoring unknown keys."""
+    return SessionRecord(**{
+        k: v for k, v in data.items() if k in _SESSION_FIELDS
+    })
+
+
 class SessionManager:
     """Manages session lifecycle, metadata, and logging.
 
@@ -79,8 +192,13 @@ class SessionManager:
         cameras: Optional[dict] = None,
     ):
         self.sessions_dir = Path(sessions_dir)
+        # Append-only index of every sidecar write; read in one pass at startup
+        self._history_index = self.sessions_dir / "history.jsonl"
         self.export_dir = Path(export_dir)
         self.tz = ZoneInfo(tz_name)
+        # tzinfo used for local timestamps: a fixed offset when the zone has
+        # no DST (e.g. Asia/Seoul), skipping ZoneInfo's transition lookup
+        self._local_tz = _fixed_offset_tz(self.tz)
         self.cameras = cameras or {"chamber_0": "pi_cam_0", "chamber_1": "pi_cam_1"}
 
         # Current pending metadata (set by API before session starts)
@@ -90,7 +208,8 @@ class SessionManager:
         self._active_session: Optional[SessionRecord] = None
 
         # History of completed sessions (in-memory, also persisted to disk)
-        self._history: list[SessionRecord] = []
+        self._history: deque[SessionRecord] = deque(maxlen=HISTORY_MAX_RECORDS)
+        self._history_total = 0  # All sessions on record, in memory or not
 
         # Ensure directories exist
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
@@ -99,6 +218,14 @@ class SessionManager:
         # Load existing session history from disk
         self._load_history()
 
+        # Sidecar/index writes run on one background thread (preserving
+        # order) so disk latency never stalls the Radiens poll loop
+        self._write_q: queue.Queue[dict] = queue.Queue()
+        self._writer = threading.Thread(
+            target=self._writer_loop, daemon=True, name="session-writer"
+        )
+        self._writer.start()
+
     def set_metadata(
         self,
         mouse_id: Optional[str] = None,
@@ -107,14 +234,12 @@ class SessionManager:
         chamber: Optional[int] = None,
     ) -> SessionMetadata:
         """Set metadata for the next session. Partial updates allowed."""
-        if mouse_id is not None:
-            self._pending_metadata.mouse_id = mouse_id
-        if recording_type is not None:
-            self._pending_metadata.recording_type = recording_type
-        if user_name is not None:
-            self._pending_metadata.user_name = user_name
-        if chamber is not None:
-            self._pending_metadata.chamber = chamber
+        self._pending_metadata.update(
+            mouse_id=mouse_id,
+            recording_type=recording_type,
+            user_name=user_name,
+            chamber=chamber,
+        )
 
         logger.info(
             "Session metadata updated: mouse=%s, type=%s, user=%s, chamber=%d",
@@ -147,7 +272,7 @@ class SessionManager:
             The new SessionRecord.
         """
         now_utc = time.time()
-        now_local = datetime.fromtimestamp(now_utc, tz=self.tz)
+        now_local = datetime.fromtimestamp(now_utc, tz=self._local_tz)
 
         meta = self._pending_metadata
         camera_key = f"chamber_{meta.chamber}"
@@ -196,7 +321,7 @@ class SessionManager:
 
         session = self._active_session
         now_utc = time.time()
-        now_local = datetime.fromtimestamp(now_utc, tz=self.tz)
+        now_local = datetime.fromtimestamp(now_utc, tz=self._local_tz)
 
         session.end_time_utc = now_utc
         session.end_time_local = now_local.isoformat()
@@ -214,6 +339,7 @@ class SessionManager:
 
         # Add to history
         self._history.append(session)
+        self._history_total += 1
 
         # Clear active session and metadata for next run
         self._active_session = None
@@ -234,7 +360,7 @@ class SessionManager:
 
         session = self._active_session
         now_utc = time.time()
-        now_local = datetime.fromtimestamp(now_utc, tz=self.tz)
+        now_local = datetime.fromtimestamp(now_utc, tz=self._local_tz)
 
         session.end_time_utc = now_utc
         session.end_time_local = now_local.isoformat()
@@ -249,64 +375,192 @@ class SessionManager:
 
         self._write_session_json(session)
         self._history.append(session)
+        self._history_total += 1
         self._active_session = None
         self.clear_metadata()
 
         return session
 
-    def update_export_status(self, status: str):
-        """Update the export status of the most recent session."""
-        if self._history:
-            self._history[-1].export_status = status
-            # Re-write the session JSON with updated status
-            self._write_session_json(self._history[-1])
+    def update_export_status(self, session: SessionRecord, status: str):
+        """Update the export status of a completed session.
+
+        A status equal to the current one is a no-op (no disk write).
+        """
+        if session.export_status == status:
+            return
+        session.export_status = status
+        # Re-write the session JSON with updated status
+        self._write_session_json(session)
 
     def _generate_filename(self, session: SessionRecord) -> str:
         """Generate filename: YYMMDDHHMM_mouseID_type.mp4
 
         Uses local time (Asia/Seoul) for the timestamp portion.
         """
-        start_local = datetime.fromtimestamp(session.start_time_utc, tz=self.tz)
-        timestamp = start_local.strftime("%y%m%d%H%M")
+        dt = datetime.fromtimestamp(session.start_time_utc, tz=self._local_tz)
+        # Same as strftime("%y%m%d%H%M"), without the locale-aware formatter
+        timestamp = (
+            f"{dt.year % 100:02d}{dt.month:02d}{dt.day:02d}"
+            f"{dt.hour:02d}{dt.minute:02d}"
+        )
         mouse = session.mouse_id.replace(" ", "_")
         rec_type = session.recording_type.replace(" ", "_")
         return f"{timestamp}_{mouse}_{rec_type}.mp4"
 
+    def flush(self):
+        """Block until all queued session JSON writes are on disk."""
+        self._write_q.join()
+
     def _write_session_json(self, session: SessionRecord):
-        """Write session sidecar JSON to disk."""
+        """Queue the session sidecar JSON for writing by the writer thread.
+
+        The record is snapshotted here, so later changes to the session do
+        not leak into this write.
+        """
+        self._write_q.put(session.to_dict())
+
+    def _writer_loop(self):
+        while True:
+            data = self._write_q.get()
+            try:
+                self._do_write_json(data)
+            finally:
+                self._write_q.task_done()
+
+    def _do_write_json(self, data: dict):
+        """Write session sidecar JSON to disk and append it to the index.
+
+        Written to a temp file and renamed into place, so a crash mid-write
+        never leaves a truncated sidecar behind.
+        """
         # Filename: same as video but with _session.json suffix
-        base = session.video_filename.rsplit(".", 1)[0] if session.video_filename else session.session_id
+        video_filename = data["video_filename"]
+        base = video_filename.rsplit(".", 1)[0] if video_filename else data["session_id"]
         json_filename = f"{base}_session.json"
         json_path = self.sessions_dir / json_filename
+        tmp_path = json_path.with_suffix(".json.tmp")
 
         try:
-            data = asdict(session)
-            with open(json_path, "w") as f:
-                json.dump(data, f, indent=2)
+            with open(tmp_path, "wb") as f:
+                f.write(_dumps(data, indent=True))
+            os.replace(tmp_path, json_path)
             logger.info("Session JSON written: %s", json_path)
         except Exception as e:
             logger.error("Failed to write session JSON to %s: %s", json_path, e)
+            return
+
+        # Later lines for the same session_id supersede earlier ones
+        try:
+            with open(self._history_index, "ab") as f:
+                f.write(_dumps(data) + b"\n")
+        except Exception as e:
+            logger.error("Failed to append to %s: %s", self._history_index, e)
+
+    def get_history(self, limit: int, offset: int = 0) -> list[SessionRecord]:
+        """Completed sessions, newest first, skipping the newest ``offset``.
+
+        Served from memory unless the page reaches past the in-memory
+        window into sessions that only exist in history.jsonl.
+        """
+        in_memory = len(self._history)
+        if in_memory == self._history_total or offset + limit <= in_memory:
+            return list(islice(reversed(self._history), offset, offset + limit))
+
+        # Copy first (one C call): the poll thread may append while we
+        # read the index, and iterating a mutated deque raises
+        snapshot = list(self._history)
+
+        # In-memory records are authoritative: the index may still lack
+        # writes queued for the writer thread
+        records, _ = self._read_history_index()
+        by_id = {r.session_id: r for r in records}
+        for record in snapshot:
+            by_id[record.session_id] = record
+        merged = list(by_id.values())
+        merged.reverse()
+        return merged[offset:offset + limit]
 
     def _load_history(self):
-        """Load session history from existing JSON files on disk."""
+        """Load session history from the JSONL index.
+
+        Falls back to scanning the per-session JSON files when there is no
+        index yet (first run after upgrade) and builds the index from them.
+        Only the newest HISTORY_MAX_RECORDS records are kept in memory.
+        """
+        if self._history_index.exists():
+            records, lines = self._read_history_index()
+            # Drop superseded status updates so the index stays one line
+            # per session
+            if len(records) < lines:
+                self._rewrite_history_index(records)
+        else:
+            records = self._load_history_files()
+            if records:
+                self._rewrite_history_index(records)
+
+        self._history.extend(records)
+        self._history_total = len(records)
+        if records:
+            logger.info("Loaded %d session records from disk", len(records))
+
+    def _read_history_index(self) -> tuple[list[SessionRecord], int]:
+        """Read history.jsonl, keeping the last line written per session.
+
+        Returns:
+            The records in first-written order, and the number of lines read.
+        """
+        by_id: dict[str, SessionRecord] = {}
+        lines = 0
+        try:
+            with open(self._history_index, "rb") as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    lines += 1
+                    # A last line without its newline is still being
+                    # appended by the writer thread (or was cut short; it
+                    # still counts, so _load_history compacts it away)
+                    if not line.endswith(b"\n"):
+                        continue
+                    try:
+                        record = _record_from_dict(_loads(line))
+                    except Exception as e:
+                        logger.warning(
+                            "Skipping bad line in %s: %s", self._history_index, e
+                        )
+                        continue
+                    by_id[record.session_id] = record
+        except Exception as e:
+            logger.warning("Failed to read %s: %s", self._history_index, e)
+
+        return list(by_id.values()), lines
+
+    def _load_history_files(self) -> list[SessionRecord]:
+        """Load session history from the per-session JSON files."""
+        records = []
         try:
             json_files = sorted(self.sessions_dir.glob("*_session.json"))
             for json_file in json_files:
                 try:
-                    with open(json_file) as f:
-                        data = json.load(f)
-                    record = SessionRecord(**{
-                        k: v for k, v in data.items()
-                        if k in SessionRecord.__dataclass_fields__
-                    })
-                    self._history.append(record)
+                    with open(json_file, "rb") as f:
+                        data = _loads(f.read())
+                    records.append(_record_from_dict(data))
                 except Exception as e:
                     logger.warning("Failed to load session file %s: %s", json_file, e)
-
-            if self._history:
-                logger.info("Loaded %d session records from disk", len(self._history))
         except Exception as e:
             logger.warning("Failed to scan session history directory: %s", e)
+        return records
+
+    def _rewrite_history_index(self, records: list[SessionRecord]):
+        """Replace history.jsonl with one line per record."""
+        tmp_path = self._history_index.with_suffix(".jsonl.tmp")
+        try:
+            with open(tmp_path, "wb") as f:
+                for record in records:
+                    f.write(_dumps(record.to_dict()) + b"\n")
+            os.replace(tmp_path, self._history_index)
+        except Exception as e:
+            logger.warning("Failed to rewrite %s: %s", self._history_index, e)
 
     @property
     def active_session(self) -> Optional[SessionRecord]:
@@ -319,10 +573,15 @@ class SessionManager:
         return self._pending_metadata
 
     @property
-    def history(self) -> list[SessionRecord]:
-        """All completed sessions."""
+    def history(self) -> deque[SessionRecord]:
+        """Most recent completed sessions, oldest first (see get_history())."""
         return self._history
 
+    @property
+    def history_total(self) -> int:
+        """Number of completed sessions on record, including ones on disk only."""
+        return self._history_total
+
     @property
     def has_active_session(self) -> bool:
         return self._active_session is not None